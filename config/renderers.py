@@ -0,0 +1,37 @@
+"""Custom DRF renderers."""
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSON renderer backed by orjson's C encoder — several times faster than
+    the stdlib json used by DRF's default renderer on large list responses.
+
+    Indented output (the browsable API's pretty-printing) is delegated to
+    the stock renderer since orjson only emits 2-space indents.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        indent = self.get_indent(accepted_media_type or '', renderer_context or {})
+        if indent is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+        # default=str covers Decimal and other types orjson doesn't know;
+        # dates, times, datetimes and UUIDs are serialized natively.
+        return orjson.dumps(data, default=str)
+
+
+class NDJSONRenderer(ORJSONRenderer):
+    """
+    Registers the ``ndjson`` format with DRF's content negotiation so
+    ``?format=ndjson`` reaches the streaming branches (DRF 404s on
+    format values no renderer claims). Views using it return a
+    StreamingHttpResponse themselves; non-streaming responses fall back
+    to plain JSON output.
+    """
+
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
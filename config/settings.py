@@ -105,6 +105,24 @@ else:
         }
     }
 
+# Cache
+# When REDIS_URL is set the cache (and therefore the cached swagger schema)
+# is shared across all gunicorn workers, so the spec is computed once per
+# deploy instead of once per process. Falls back to per-process memory.
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -168,6 +186,10 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'users.authentication.AccessTokenOnlyAuthentication',
     ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'config.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
 }
 
 # JWT settings
@@ -206,4 +228,9 @@ SWAGGER_SETTINGS = {
     },
 }
 
+# How long (seconds) generated swagger/redoc schemas are cached.
+# Schema introspection walks every route and serializer, so recomputing
+# it per request is expensive; 0 disables caching.
+SWAGGER_CACHE_TIMEOUT = int(os.environ.get('SWAGGER_CACHE_TIMEOUT', 60 * 60))
+
 
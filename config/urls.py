@@ -6,8 +6,9 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import path, include, re_path
+from django.views.decorators.cache import cache_page
 
-from rest_framework.routers import DefaultRouter
+from rest_framework.routers import SimpleRouter
 from rest_framework import permissions
 from rest_framework_simplejwt.views import (
     TokenObtainPairView,
@@ -31,6 +32,8 @@ from duties.views import (
 # ------------------------------------------------------------------------------
 # Swagger / API documentation setup
 # ------------------------------------------------------------------------------
+SCHEMA_CACHE_TIMEOUT = getattr(settings, "SWAGGER_CACHE_TIMEOUT", 60 * 60)
+
 schema_view = get_schema_view(
     openapi.Info(
         title="Duty Chart Management API",
@@ -65,7 +68,9 @@ schema_view.security = [{"Bearer": []}]
 # ------------------------------------------------------------------------------
 # DRF Router registrations (single router for all ViewSets)
 # ------------------------------------------------------------------------------
-router = DefaultRouter()
+# SimpleRouter: skips DefaultRouter's API-root view, which reverse()s every
+# registered viewset per request and inflates URL-resolver startup cost.
+router = SimpleRouter()
 
 # Users
 router.register(r"users", UserViewSet)
@@ -110,19 +115,23 @@ urlpatterns = [
     path("api-auth/", include("rest_framework.urls")),
 
     # Swagger / ReDoc
+    # Schema generation walks every route/serializer, so cache the result
+    # instead of recomputing it per request (cache_timeout=0 disabled caching).
     re_path(
         r"^swagger(?P<format>\.json|\.yaml)$",
-        schema_view.without_ui(cache_timeout=0),
+        cache_page(SCHEMA_CACHE_TIMEOUT)(
+            schema_view.without_ui(cache_timeout=SCHEMA_CACHE_TIMEOUT)
+        ),
         name="schema-json",
     ),
     path(
         "swagger/",
-        schema_view.with_ui("swagger", cache_timeout=0),
+        schema_view.with_ui("swagger", cache_timeout=SCHEMA_CACHE_TIMEOUT),
         name="schema-swagger-ui",
     ),
     path(
         "redoc/",
-        schema_view.with_ui("redoc", cache_timeout=0),
+        schema_view.with_ui("redoc", cache_timeout=SCHEMA_CACHE_TIMEOUT),
         name="schema-redoc",
     ),
 ]
@@ -1,13 +1,83 @@
 from django.contrib import admin
+from django.core.cache import cache
+from org.models import Directorate, Department, Office
 from .models import DutyChart, Duty, RosterAssignment  # added RosterAssignment import
 
+
+class CachedOrgListFilter(admin.SimpleListFilter):
+    """
+    Sidebar filter whose choices come from a cached catalogue query on the
+    org table itself. The plain deep-FK list_filter entries made Django run
+    a SELECT DISTINCT across the joined duty tables for every changelist
+    page view just to draw the sidebar.
+    """
+    org_model = None       # org model providing the choices
+    filter_path = None     # lookup path on the changelist queryset
+
+    def lookups(self, request, model_admin):
+        return cache.get_or_set(
+            f"admin_org_filter:{self.org_model._meta.model_name}",
+            lambda: list(self.org_model.objects.values_list("id", "name")),
+            300,
+        )
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(**{self.filter_path: self.value()})
+        return queryset
+
+
+class ChartDirectorateFilter(CachedOrgListFilter):
+    title = "directorate"
+    parameter_name = "directorate"
+    org_model = Directorate
+    filter_path = "office__department__directorate_id"
+
+
+class ChartDepartmentFilter(CachedOrgListFilter):
+    title = "department"
+    parameter_name = "department"
+    org_model = Department
+    filter_path = "office__department_id"
+
+
+class ChartOfficeFilter(CachedOrgListFilter):
+    title = "office"
+    parameter_name = "office"
+    org_model = Office
+    filter_path = "office_id"
+
+
+class DutyDirectorateFilter(ChartDirectorateFilter):
+    filter_path = "duty_chart__office__department__directorate_id"
+
+
+class DutyDepartmentFilter(ChartDepartmentFilter):
+    filter_path = "duty_chart__office__department_id"
+
+
+class DutyOfficeFilter(ChartOfficeFilter):
+    filter_path = "duty_chart__office_id"
+
+
 @admin.register(DutyChart)
 class DutyChartAdmin(admin.ModelAdmin):
     list_display = ('office', 'get_department', 'get_directorate', 'effective_date', 'end_date')
-    list_filter = ('office__department__directorate', 'office__department', 'office')
+    list_filter = (ChartDirectorateFilter, ChartDepartmentFilter, ChartOfficeFilter)
     search_fields = ('office__name', 'office__department__name', 'office__department__directorate__name')
     autocomplete_fields = ['office']
     date_hierarchy = 'effective_date'
+    # list_display/__str__ touch the whole org chain; join it once per page
+    list_select_related = ('office__department__directorate',)
+
+    def get_queryset(self, request):
+        # list_select_related only covers the changelist; autocomplete,
+        # LogEntry messages and delete confirmations also render __str__,
+        # which falls back to "office #<id>" when the relation isn't
+        # loaded. Join it for every admin queryset.
+        return super().get_queryset(request).select_related(
+            'office__department__directorate'
+        )
 
     def get_department(self, obj):
         return obj.office.department.name
@@ -25,22 +95,30 @@ class DutyAdmin(admin.ModelAdmin):
     list_display = ('user', 'duty_chart', 'date', 'shift', 'start_time', 'end_time',
                    'is_completed', 'currently_available')
     list_filter = ('shift', 'is_completed', 'currently_available',
-                  'duty_chart__office__department__directorate',
-                  'duty_chart__office__department',
-                  'duty_chart__office')
+                  DutyDirectorateFilter,
+                  DutyDepartmentFilter,
+                  DutyOfficeFilter)
     search_fields = ('user__full_name', 'user__employee_id',
                     'duty_chart__office__name',
                     'duty_chart__office__department__name',
                     'duty_chart__office__department__directorate__name')
     autocomplete_fields = ['user', 'duty_chart']
     date_hierarchy = 'date'
+    # duty_chart's __str__ and the user column each dereference FKs per row
+    list_select_related = ('user', 'duty_chart__office__department__directorate')
+
+    def get_queryset(self, request):
+        # Same as DutyChartAdmin: keep __str__ labels intact outside the
+        # changelist (autocomplete, log entries, delete confirmations).
+        return super().get_queryset(request).select_related(
+            'user', 'duty_chart__office__department__directorate'
+        )
 
 
 # NEW: Admin for strict roster assignments
 # admin.py
 from django.contrib import admin, messages
 from django import forms
-import pandas as pd
 from .models import RosterAssignment
 from django.core.exceptions import ValidationError
 
@@ -60,7 +138,6 @@ from django.contrib import admin, messages
 from django.shortcuts import render, redirect
 from django.urls import path
 from django.core.exceptions import ValidationError
-import pandas as pd
 from .models import RosterAssignment, Office
 
 
@@ -77,7 +154,6 @@ from django.shortcuts import render, redirect
 from django.db import transaction
 from django.utils.safestring import mark_safe
 
-import pandas as pd
 
 from .models import RosterAssignment  # adjust if your model import path differs
 from .forms import RosterBulkUploadForm
@@ -97,15 +173,16 @@ from django.contrib import admin, messages
 from django.shortcuts import redirect, render
 from django.urls import path, reverse
 from django.utils.safestring import mark_safe
-import pandas as pd
 
 from .models import RosterAssignment
 from .forms import RosterBulkUploadForm
-from .serializers import (
-    ALLOWED_HEADERS,
-    HEADER_MAP,
-    RosterAssignmentSerializer,
-)
+from django.conf import settings
+
+from .serializers import ALLOWED_HEADERS
+from django.http import Http404, JsonResponse
+
+from .tasks import enqueue_roster_upload, job_status
+from .uploads import RosterImportError, import_roster_file
 
 from django.contrib import admin
 from .models import RosterAssignment
@@ -131,9 +208,21 @@ class RosterAssignmentAdmin(admin.ModelAdmin):
                 self.admin_site.admin_view(self.bulk_upload_view),
                 name="roster_bulk_upload",
             ),
+            path(
+                "bulk-upload/status/<str:job_id>/",
+                self.admin_site.admin_view(self.bulk_upload_status_view),
+                name="roster_bulk_upload_status",
+            ),
         ]
         return custom + urls
 
+    def bulk_upload_status_view(self, request, job_id):
+        """Expose the cached background-import status as JSON for polling."""
+        status = job_status(job_id)
+        if status is None:
+            raise Http404("Unknown or expired upload job.")
+        return JsonResponse(status)
+
     def changelist_view(self, request, extra_context=None):
         extra_context = extra_context or {}
         extra_context["bulk_upload_url"] = reverse("admin:roster_bulk_upload")
@@ -145,57 +234,34 @@ class RosterAssignmentAdmin(admin.ModelAdmin):
             form = RosterBulkUploadForm(request.POST, request.FILES)
             if form.is_valid():
                 f = form.cleaned_data["file"]
-                try:
-                    # Try openpyxl first; fallback for .xls
-                    try:
-                        df = pd.read_excel(f, engine="openpyxl")
-                    except Exception:
-                        f.seek(0)
-                        df = pd.read_excel(f)
-                except Exception as e:
-                    messages.error(request, f"Could not read Excel file: {e}")
-                    return redirect("admin:duties_rosterassignment_changelist")
 
-                # Normalize headers
-                df.columns = [str(c).strip() for c in df.columns]
-
-                # Strict header check
-                if list(df.columns) != ALLOWED_HEADERS:
-                    missing = [c for c in ALLOWED_HEADERS if c not in df.columns]
-                    extra = [c for c in df.columns if c not in ALLOWED_HEADERS]
-                    msg_parts = []
-                    if missing:
-                        msg_parts.append(f"Missing columns: {', '.join(missing)}")
-                    if extra:
-                        msg_parts.append(f"Unexpected columns: {', '.join(extra)}")
-                    messages.error(request, " | ".join(msg_parts))
+                # Big sheets are parsed and inserted on a background thread so
+                # the request (and its gunicorn worker) returns immediately;
+                # progress is tracked in the cache under the returned job id.
+                threshold = getattr(settings, "ROSTER_UPLOAD_ASYNC_THRESHOLD", 1024 * 1024)
+                if f.size and f.size > threshold:
+                    job_id = enqueue_roster_upload(f)
+                    status_url = reverse(
+                        "admin:roster_bulk_upload_status", args=[job_id]
+                    )
+                    messages.info(
+                        request,
+                        mark_safe(
+                            f"Large upload queued for background processing "
+                            f'(job {job_id} — <a href="{status_url}">check status</a>).'
+                        ),
+                    )
                     return redirect("admin:duties_rosterassignment_changelist")
 
-                created_count, updated_count, failed_count = 0, 0, 0
-                row_errors = []
-
-                # Use only required columns in expected order
-                df = df[ALLOWED_HEADERS]
-
-                for idx, row in df.iterrows():
-                    try:
-                        # Map human-friendly headers to model fields
-                        row_dict = {HEADER_MAP[col]: row[col] for col in ALLOWED_HEADERS}
-
-                        # Pass to serializer for validation + saving
-                        serializer = RosterAssignmentSerializer(data=row_dict)
-                        serializer.is_valid(raise_exception=True)
-                        instance = serializer.save()
-
-                        # Track created vs updated
-                        if getattr(instance, "_state", None) and not instance._state.adding:
-                            updated_count += 1
-                        else:
-                            created_count += 1
-
-                    except Exception as e:
-                        failed_count += 1
-                        row_errors.append(f"Row {idx + 2}: {e}")  # Excel rows are 1‑based
+                try:
+                    result = import_roster_file(f)
+                except RosterImportError as e:
+                    messages.error(request, str(e))
+                    return redirect("admin:duties_rosterassignment_changelist")
+                created_count = result["created"]
+                updated_count = result["updated"]
+                failed_count = result["failed"]
+                row_errors = result["errors"]
 
                 # Messaging
                 if created_count:
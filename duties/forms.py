@@ -2,8 +2,7 @@
 from django import forms
 
 from django import forms
-import pandas as pd
-from .serializers import ALLOWED_HEADERS
+from .serializers import ALLOWED_HEADERS_TUPLE, ALLOWED_HEADER_SET
 
 class RosterBulkUploadForm(forms.Form):
     file = forms.FileField()
@@ -17,6 +16,8 @@ class RosterBulkUploadForm(forms.Form):
             raise forms.ValidationError("Only .xlsx or .xls Excel files are allowed.")
 
         # Try loading just the header row to validate columns
+        # (pandas imported lazily — keeps it off the worker startup path)
+        import pandas as pd
         try:
             try:
                 df = pd.read_excel(f, nrows=0, engine="openpyxl")
@@ -29,9 +30,10 @@ class RosterBulkUploadForm(forms.Form):
         # Normalize headers
         df.columns = [str(c).strip() for c in df.columns]
 
-        if list(df.columns) != ALLOWED_HEADERS:
-            missing = [c for c in ALLOWED_HEADERS if c not in df.columns]
-            extra = [c for c in df.columns if c not in ALLOWED_HEADERS]
+        if tuple(df.columns) != ALLOWED_HEADERS_TUPLE:
+            col_set = frozenset(df.columns)
+            missing = [c for c in ALLOWED_HEADERS_TUPLE if c not in col_set]
+            extra = [c for c in df.columns if c not in ALLOWED_HEADER_SET]
             msg_parts = []
             if missing:
                 msg_parts.append(f"Missing columns: {', '.join(missing)}")
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.17 on 2026-08-27 04:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('duties', '0015_remove_schedule_user'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='rosterassignment',
+            index=models.Index(fields=['start_date', 'employee_name'], name='ra_startdate_emp_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.17 on 2026-08-27 04:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('duties', '0016_rosterassignment_ra_startdate_emp_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='duty',
+            index=models.Index(condition=models.Q(('currently_available', True), ('is_completed', False)), fields=['date', 'shift'], name='duty_active_idx'),
+        ),
+    ]
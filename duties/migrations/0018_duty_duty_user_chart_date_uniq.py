@@ -0,0 +1,19 @@
+# Generated by Django 5.2.17 on 2026-08-27 05:03
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('duties', '0017_duty_duty_active_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='duty',
+            constraint=models.UniqueConstraint(fields=('user', 'duty_chart', 'date'), name='duty_user_chart_date_uniq'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.17 on 2026-08-27 05:07
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('duties', '0018_duty_duty_user_chart_date_uniq'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='duty',
+            index=models.Index(fields=['duty_chart', 'date'], name='duty_chart_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(fields=['start_date', 'employee_name'], name='sched_startdate_emp_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations
+
+
+def add_trgm_index(apps, schema_editor):
+    # icontains filters on employee_name compile to ILIKE '%...%', which a
+    # b-tree can never serve; a trigram GIN index lets the planner use an
+    # index scan instead of walking the heap. PostgreSQL only — sqlite
+    # (DEBUG) has no pg_trgm, so this is a no-op there.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS ra_emp_trgm "
+        "ON duties_rosterassignment USING gin (employee_name gin_trgm_ops)"
+    )
+
+
+def drop_trgm_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS ra_emp_trgm")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("duties", "0019_duty_duty_chart_date_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_trgm_index, drop_trgm_index),
+    ]
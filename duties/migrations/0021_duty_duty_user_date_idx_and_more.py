@@ -0,0 +1,24 @@
+# Generated by Django 5.2.17 on 2026-08-27 05:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('duties', '0020_rosterassignment_employee_trgm_idx'),
+        ('org', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='duty',
+            index=models.Index(fields=['user', 'date'], name='duty_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dutychart',
+            index=models.Index(fields=['office', 'effective_date'], name='chart_office_effdate_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.17 on 2026-08-27 05:16
+
+import duties.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('duties', '0021_duty_duty_user_date_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='document',
+            name='id',
+            field=models.UUIDField(default=duties.models.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
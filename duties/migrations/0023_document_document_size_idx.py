@@ -0,0 +1,19 @@
+# Generated by Django 5.2.17 on 2026-08-27 05:17
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('duties', '0022_alter_document_id'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='document',
+            index=models.Index(fields=['size'], name='document_size_idx'),
+        ),
+    ]
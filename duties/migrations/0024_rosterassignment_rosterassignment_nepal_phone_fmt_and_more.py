@@ -0,0 +1,21 @@
+# Generated by Django 5.2.17 on 2026-08-27 05:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('duties', '0023_document_document_size_idx'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='rosterassignment',
+            constraint=models.CheckConstraint(condition=models.Q(('phone_number__isnull', True), ('phone_number', ''), ('phone_number__regex', '^\\+977\\d{10}$'), _connector='OR'), name='rosterassignment_nepal_phone_fmt'),
+        ),
+        migrations.AddConstraint(
+            model_name='schedule',
+            constraint=models.CheckConstraint(condition=models.Q(('phone_number__isnull', True), ('phone_number', ''), ('phone_number__regex', '^\\+977\\d{10}$'), _connector='OR'), name='schedule_nepal_phone_fmt'),
+        ),
+    ]
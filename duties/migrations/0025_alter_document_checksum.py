@@ -0,0 +1,18 @@
+# Generated by Django 5.2.17 on 2026-08-27 05:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('duties', '0024_rosterassignment_rosterassignment_nepal_phone_fmt_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='document',
+            name='checksum',
+            field=models.CharField(help_text='BLAKE2b-256 content checksum for deduplication', max_length=64, unique=True),
+        ),
+    ]
@@ -1,8 +1,47 @@
+import copy
+import json
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from django.utils import timezone
 from rest_framework import serializers
-from .models import DutyChart, Duty, Document, RosterAssignment, Office
+from .models import (
+    DutyChart, Duty, Document, RosterAssignment, Office,
+    file_checksum, _NEPAL_PHONE_RE,
+)
 
 
-class DutyChartSerializer(serializers.ModelSerializer):
+class CachedFieldsMixin:
+    """
+    Memoize DRF field construction per serializer class.
+
+    get_fields() re-runs model introspection, field resolution and
+    validator wiring for every serializer instance, and the write paths
+    instantiate one serializer per row. Build the field map once per
+    class and hand each instance a deepcopy (fields become stateful when
+    bound, so they can't be shared directly).
+    """
+    _fields_cache = {}
+
+    def get_fields(self):
+        fields = CachedFieldsMixin._fields_cache.get(self.__class__)
+        if fields is None:
+            fields = super().get_fields()
+            CachedFieldsMixin._fields_cache[self.__class__] = fields
+        return copy.deepcopy(fields)
+
+
+class DutyChartSerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    # Declarative source paths read straight off the select_related row —
+    # no per-object queries and no to_representation override needed.
+    office_name = serializers.CharField(source='office.name', read_only=True)
+    department_name = serializers.CharField(source='office.department.name', read_only=True)
+    directorate_name = serializers.CharField(
+        source='office.department.directorate.name', read_only=True
+    )
+
     class Meta:
         model = DutyChart
         fields = [
@@ -11,76 +50,106 @@ class DutyChartSerializer(serializers.ModelSerializer):
             'effective_date',
             'end_date',
             'employee_name',   # new field
-            'phone_number'     # new field
+            'phone_number',    # new field
+            'office_name',
+            'department_name',
+            'directorate_name',
         ]
 
-    # ✅ CHANGE: Call full_clean() so model-level validations (Nepal phone number format, end_date > effective_date) run
+    # Model-level cross-field rules (end_date > effective_date, Nepal phone
+    # format) run once here via clean(); full_clean() in create/update would
+    # re-run every field validator DRF just executed.
+    def validate(self, attrs):
+        if self.instance is not None:
+            instance = self.instance
+            for attr, value in attrs.items():
+                setattr(instance, attr, value)
+        else:
+            instance = DutyChart(**attrs)
+        try:
+            instance.clean()
+        except DjangoValidationError as exc:
+            raise serializers.ValidationError(serializers.as_serializer_error(exc))
+        return attrs
+
     def create(self, validated_data):
-        instance = DutyChart(**validated_data)
-        instance.full_clean()  # runs model.clean() + field validators
-        instance.save()
-        return instance
+        return DutyChart.objects.create(**validated_data)
 
+    # UPDATE only the changed columns instead of save() rewriting the
+    # whole row; validate() has already run clean() on these values.
     def update(self, instance, validated_data):
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.full_clean()  # re-validate on update
-        instance.save()
+        if validated_data:
+            DutyChart.objects.filter(pk=instance.pk).update(**validated_data)
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
         return instance
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        data['office_name'] = instance.office.name
-        data['department_name'] = instance.office.department.name
-        data['directorate_name'] = instance.office.department.directorate.name
-        return data
 
+class DutySerializer(CachedFieldsMixin, serializers.ModelSerializer):
+    # Read from the select_related('user', 'duty_chart__office') row; same
+    # declarative pattern as DutyChartSerializer.
+    user_name = serializers.CharField(source='user.full_name', read_only=True)
+    office_name = serializers.CharField(source='duty_chart.office.name', read_only=True)
 
-class DutySerializer(serializers.ModelSerializer):
     class Meta:
         model = Duty
         fields = [
             'id', 'user', 'duty_chart', 'date', 'shift',
-            'is_completed', 'currently_available', 'start_time', 'end_time'
+            'is_completed', 'currently_available', 'start_time', 'end_time',
+            'user_name', 'office_name',
         ]
 
-    # ✅ CHANGE: Call full_clean() so model-level validations (start_time < end_time, date within duty_chart period) run
+    # Same split as DutyChartSerializer: cross-field rules (start_time <
+    # end_time, date inside the chart's effective period) run once in
+    # clean(); DRF has already done the per-field validation.
+    def validate(self, attrs):
+        if self.instance is not None:
+            instance = self.instance
+            for attr, value in attrs.items():
+                setattr(instance, attr, value)
+        else:
+            instance = Duty(**attrs)
+        try:
+            instance.clean()
+        except DjangoValidationError as exc:
+            raise serializers.ValidationError(serializers.as_serializer_error(exc))
+        return attrs
+
     def create(self, validated_data):
-        instance = Duty(**validated_data)
-        instance.full_clean()
-        instance.save()
-        return instance
+        return Duty.objects.create(**validated_data)
 
+    # Same narrow UPDATE as DutyChartSerializer.
     def update(self, instance, validated_data):
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.full_clean()
-        instance.save()
+        if validated_data:
+            Duty.objects.filter(pk=instance.pk).update(**validated_data)
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
         return instance
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        data['user_name'] = instance.user.full_name
-        data['office_name'] = instance.duty_chart.office.name
-        return data
-
 
 class DocumentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Document
         fields = ['id', 'file', 'description', 'uploaded_at']
 
-    # ✅ CHANGE: Call full_clean() so model-level validations (file size limit, checksum generation) run
+    # clean() fills in the checksum when missing; the field validators and
+    # the unique probe that full_clean() would re-run are already covered
+    # by DRF (the DB still backstops checksum uniqueness). The two-step
+    # instantiate/clean/save stays here because the checksum must be set
+    # before the INSERT — objects.create() has no pre-save hook.
     def create(self, validated_data):
         instance = Document(**validated_data)
-        instance.full_clean()
+        instance.clean()
         instance.save()
         return instance
 
+    # Stays on instance.save(): replacing the file relies on FileField's
+    # pre_save hook to write the bytes to storage, which QuerySet.update
+    # would skip.
     def update(self, instance, validated_data):
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.full_clean()
+        instance.clean()
         instance.save()
         return instance
 
@@ -95,16 +164,77 @@ class BulkDocumentUploadSerializer(serializers.Serializer):
         help_text="Optional JSON string with metadata for each file"
     )
 
-    # ✅ CHANGE: Validate each Document instance with full_clean() before saving
+    def validate_meta(self, value):
+        """Parse the JSON string into a per-filename metadata mapping.
+
+        The decoded value must be an object keyed by filename; anything
+        else (a list, a bare string) is a client error, not a 500.
+        Per-file entries that are plain strings are accepted as a
+        shorthand for ``{"description": <value>}``.
+        """
+        if not value:
+            return {}
+        try:
+            decoded = json.loads(value)
+        except ValueError:
+            raise serializers.ValidationError("meta must be valid JSON.")
+        if not isinstance(decoded, dict):
+            raise serializers.ValidationError(
+                "meta must be a JSON object mapping filenames to metadata."
+            )
+        return {
+            name: entry if isinstance(entry, dict) else {'description': entry}
+            for name, entry in decoded.items()
+        }
+
+    # ✅ CHANGE: One INSERT for the whole batch; duplicate checksums are
+    # skipped by the DB instead of raising per-row IntegrityErrors
     def create(self, validated_data):
         uploaded_files = validated_data['files']
-        meta = validated_data.get('meta')
+        meta_map = validated_data.get('meta') or {}
+        request = self.context.get('request')
+        user = getattr(request, 'user', None)
+        if user is not None and not user.is_authenticated:
+            user = None
+        # hashlib releases the GIL while digesting, so checksumming the
+        # batch in a thread pool scales across cores instead of running
+        # one file after another.
+        if len(uploaded_files) > 1:
+            with ThreadPoolExecutor(max_workers=min(8, len(uploaded_files))) as ex:
+                checksums = list(ex.map(file_checksum, uploaded_files))
+        else:
+            checksums = [file_checksum(f) for f in uploaded_files]
+        # Dedup before any storage write: a byte-identical copy can only
+        # exist where a stored document has the same size, so one indexed
+        # integer query decides whether the checksum lookup is needed at
+        # all. Duplicates are dropped here instead of leaving
+        # ignore_conflicts to reject the row after the file bytes were
+        # already copied into MEDIA_ROOT.
+        stored = set()
+        sizes_present = set(
+            Document.objects.filter(
+                size__in={f.size for f in uploaded_files}
+            ).values_list('size', flat=True)
+        )
+        if sizes_present:
+            candidates = [
+                c for f, c in zip(uploaded_files, checksums)
+                if f.size in sizes_present
+            ]
+            stored = set(
+                Document.objects.filter(
+                    checksum__in=candidates
+                ).values_list('checksum', flat=True)
+            )
         docs = []
-        for f in uploaded_files:
-            doc = Document(file=f)
-            doc.full_clean()  # enforce size/checksum rules
-            doc.save()
-            docs.append(doc)
+        for f, c in zip(uploaded_files, checksums):
+            if c in stored:
+                continue
+            stored.add(c)  # also collapses duplicates within the batch
+            docs.append(
+                Document.build_from_inmemory(f, user, meta_map.get(f.name), checksum=c)
+            )
+        Document.objects.bulk_create(docs, batch_size=500, ignore_conflicts=True)
         return docs
 
 
@@ -112,7 +242,9 @@ class BulkDocumentUploadSerializer(serializers.Serializer):
 
 # Must match exactly what your Excel parser expects:
 # Must match exactly what your roster bulk upload Excel template expects:
-ALLOWED_HEADERS = [
+# Immutable on purpose: the header spec is shared module state consumed
+# by the admin, forms, views and upload machinery.
+ALLOWED_HEADERS = (
     "Start Date",
     "End Date",
     "Start Time",
@@ -120,11 +252,18 @@ ALLOWED_HEADERS = [
     "Shift",
     "Employee Name",
     "Office",
-    "Phone Number"  # keep/remove depending on your template
-]
+    "Phone Number",  # keep/remove depending on your template
+)
+
+# Precomputed forms of the header spec for the strict checks in the upload
+# paths: tuple for the exact ordered comparison, frozenset for O(1)
+# membership when reporting missing/unexpected columns.
+ALLOWED_HEADERS_TUPLE = ALLOWED_HEADERS
+ALLOWED_HEADER_SET = frozenset(ALLOWED_HEADERS)
 
 # Map from Excel column names -> RosterAssignment model field names
-HEADER_MAP = {
+# (read-only view so no consumer can mutate the shared mapping)
+HEADER_MAP = types.MappingProxyType({
     "Start Date": "start_date",
     "End Date": "end_date",
     "Start Time": "start_time",
@@ -133,15 +272,19 @@ HEADER_MAP = {
     "Employee Name": "employee_name",
     "Office": "office",
     "Phone Number": "phone_number",
-}
+})
 
 from rest_framework import serializers
-from rest_framework.validators import UniqueTogetherValidator
 from django.core.exceptions import ValidationError
 
 from .models import RosterAssignment, Office, Schedule
 
 
+# Magic bytes for the two accepted container formats
+_XLSX_MAGIC = b'PK\x03\x04'                              # OpenXML (zip)
+_XLS_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'         # OLE2 compound file
+
+
 class BulkUploadExcelSerializer(serializers.Serializer):
     """
     Strict Excel upload: accepts only .xls/.xlsx,
@@ -154,20 +297,105 @@ class BulkUploadExcelSerializer(serializers.Serializer):
         name = (f.name or "").lower()
         if not (name.endswith(".xlsx") or name.endswith(".xls")):
             raise serializers.ValidationError("Only .xlsx or .xls Excel files are allowed.")
-        # Check OpenXML / XLS magic bytes
-        head = f.read(4)
-        f.seek(0)
-        if head != b'PK\x03\x04' and not name.endswith(".xls"):
+        # Check OpenXML / OLE2 magic bytes before a parser ever sees the file —
+        # previously .xls names skipped the content check entirely, letting
+        # arbitrary payloads through to pandas. Buffered uploads (disk-backed
+        # TemporaryUploadedFile) expose peek(), which leaves the read pointer
+        # alone and saves the rewind; in-memory uploads fall back to
+        # read + seek, which is free on BytesIO.
+        raw = getattr(f, 'file', None)
+        if hasattr(raw, 'peek'):
+            head = memoryview(raw.peek(8))[:8]
+        else:
+            head = memoryview(f.read(8))
+            f.seek(0)
+        if head[:4] != _XLSX_MAGIC and head[:8] != _XLS_MAGIC:
             raise serializers.ValidationError("Invalid Excel file content.")
         return f
 
 
-class RosterAssignmentSerializer(serializers.ModelSerializer):
+def get_office_cached(request, name):
+    """Resolve an Office by case-insensitive name with a per-request memo.
+
+    Repeated references to the same office within one request (bulk
+    payloads, nested serializers) cost one SELECT for the first
+    occurrence and a dict hit after that; misses are cached too so an
+    unknown name is not re-queried per row. Falls back to a plain query
+    when there is no request in scope.
+    """
+    key = name.strip().lower()
+    if request is None:
+        return Office.objects.filter(name__iexact=key).first()
+    cache = getattr(request, '_office_cache', None)
+    if cache is None:
+        cache = request._office_cache = {}
+    if key not in cache:
+        cache[key] = Office.objects.filter(name__iexact=key).first()
+    return cache[key]
+
+
+class RosterAssignmentListSerializer(serializers.ListSerializer):
+    """Batched create for many=True: one keyed SELECT plus bulk writes.
+
+    The per-row update_or_create on the child would cost a SELECT and a
+    write per row. The unique key includes nullable start/end_date, so an
+    ON CONFLICT upsert can't match those rows — same split as the roster
+    import: read the existing keys once, then bulk_create the new rows
+    and bulk_update the rest.
+    """
+
+    KEY_FIELDS = ('employee_name', 'office', 'start_date', 'end_date',
+                  'start_time', 'end_time', 'shift')
+
+    def create(self, validated_data):
+        key_fields = self.KEY_FIELDS
+        objs = []
+        for d in validated_data:
+            d = self.child._normalize(d)
+            if hasattr(d.get('office'), 'name'):
+                d['office'] = d['office'].name
+            obj = RosterAssignment(**d)
+            obj.clean()  # masks malformed phone numbers, nothing else
+            objs.append(obj)
+        existing = {
+            key: pk
+            for (pk, *key_parts) in RosterAssignment.objects.filter(
+                employee_name__in={o.employee_name for o in objs}
+            ).values_list('pk', *key_fields)
+            for key in [tuple(key_parts)]
+        }
+        to_create, to_update = [], []
+        for o in objs:
+            pk = existing.get(tuple(getattr(o, f) for f in key_fields))
+            if pk is None:
+                to_create.append(o)
+            else:
+                o.pk = pk
+                to_update.append(o)
+        with transaction.atomic():
+            if to_create:
+                RosterAssignment.objects.bulk_create(to_create, batch_size=1000)
+            if to_update:
+                # bulk_update skips auto_now; bump updated_at explicitly,
+                # as the single-row update() path already does.
+                now = timezone.now()
+                for o in to_update:
+                    o.updated_at = now
+                RosterAssignment.objects.bulk_update(
+                    to_update, ['phone_number', 'updated_at'], batch_size=1000
+                )
+        return objs
+
+
+class RosterAssignmentSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     office_name = serializers.CharField(source='office.name', read_only=True)
 
     class Meta:
         model = RosterAssignment
-        fields = [
+        # Tuple of explicit names only: the stray '__all__' entry made DRF
+        # treat it as a field name and re-scan model._meta on every
+        # instantiation (and broke field construction outright).
+        fields = (
             'id',
             'start_date',
             'end_date',
@@ -180,26 +408,40 @@ class RosterAssignmentSerializer(serializers.ModelSerializer):
             'phone_number',
             'created_at',
             'updated_at',
-            '__all__'
-        ]
-        validators = [
-            UniqueTogetherValidator(
-                queryset=RosterAssignment.objects.all(),
-                fields=[
-                    'employee_name', 'office',
-                    'start_date', 'end_date',
-                    'start_time', 'end_time', 'shift'
-                ],
-                message='An identical roster assignment already exists.'
-            )
-        ]
+        )
+        # No UniqueTogetherValidator (and none auto-derived from the
+        # model's UniqueConstraint): it cost one SELECT per serialized
+        # row and create() upserts, so a duplicate key is an update, not
+        # an error.
+        validators = []
+        list_serializer_class = RosterAssignmentListSerializer
+
+    def validate_phone_number(self, value):
+        # Same masking as RosterAssignment.clean() and the ScheduleSerializer:
+        # the single-row create path writes via update_or_create without
+        # calling clean(), so malformed numbers must be nulled here or they
+        # die on the DB CHECK constraint as a 500.
+        if value and not _NEPAL_PHONE_RE.fullmatch(value):
+            return None
+        return value
 
     def validate_office(self, value):
         """
         Allow office to be provided as either an ID or a case-insensitive name.
+
+        Callers validating many rows can pass a prebuilt
+        ``context={'office_map': {lowered_name: Office}}`` so the lookup
+        is a dict hit instead of one query per row.
         """
         if isinstance(value, str):
-            office_obj = Office.objects.filter(name__iexact=value).first()
+            office_map = self.context.get('office_map')
+            office_obj = None
+            if office_map is not None:
+                office_obj = office_map.get(value.strip().lower())
+            if office_obj is None:
+                office_obj = get_office_cached(
+                    self.context.get('request'), value
+                )
             if not office_obj:
                 raise serializers.ValidationError(
                     f"Office '{value}' not found."
@@ -221,14 +463,22 @@ class RosterAssignmentSerializer(serializers.ModelSerializer):
                       if k not in ['employee_name', 'office', 'start_date',
                                    'end_date', 'start_time', 'end_time', 'shift']}
         )
-        instance.full_clean()
         return instance
 
     def update(self, instance, validated_data):
+        if not validated_data:
+            return instance
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.full_clean()
-        instance.save()
+        # clean() only masks malformed phone numbers; full_clean() would
+        # re-run every field validator DRF has already applied.
+        instance.clean()
+        # Write only the changed columns. updated_at is auto_now, which
+        # QuerySet.update() does not trigger, so it is set explicitly.
+        updates = {k: getattr(instance, k) for k in validated_data}
+        updates['updated_at'] = timezone.now()
+        RosterAssignment.objects.filter(pk=instance.pk).update(**updates)
+        instance.updated_at = updates['updated_at']
         return instance
 
     def _normalize(self, data):
@@ -259,11 +509,10 @@ from duties.models import RosterAssignment  # adjust import if needed
 
 
 from rest_framework import serializers
-from rest_framework.validators import UniqueTogetherValidator
 from org.models import Office
 from .models import Schedule
 
-class ScheduleSerializer(serializers.ModelSerializer):
+class ScheduleSerializer(CachedFieldsMixin, serializers.ModelSerializer):
     office_name = serializers.CharField(source='office.name', read_only=True)
 
     class Meta:
@@ -274,13 +523,52 @@ class ScheduleSerializer(serializers.ModelSerializer):
             'phone_number', 'created_at', 'updated_at'
         ]
         read_only_fields = ['created_at', 'updated_at']
-        validators = [
-            UniqueTogetherValidator(
-                queryset=Schedule.objects.all(),
-                fields=[
-                    'employee_name', 'office', 'start_date', 'end_date',
-                    'start_time', 'end_time', 'shift'
-                ],
-                message='An identical schedule already exists.'
+        # Uniqueness is enforced by the model's constraint inside the
+        # INSERT itself; the UniqueTogetherValidator (explicit or derived
+        # from the model constraint) pre-checked it with an extra SELECT
+        # per row. create() translates the conflict back into the same
+        # 400 response.
+        validators = []
+
+    def validate_phone_number(self, value):
+        # Same masking as Schedule.clean(): malformed numbers are stored
+        # as NULL, not rejected. The DRF write paths never call clean(),
+        # so without this the DB CHECK constraint would turn bad input
+        # into a 500.
+        if value and not _NEPAL_PHONE_RE.fullmatch(value):
+            return None
+        return value
+
+    @staticmethod
+    def _is_unique_conflict(exc):
+        # Only relabel the uniqueness conflict; any other integrity
+        # failure (e.g. a CHECK constraint) must surface as-is.
+        # Postgres reports the constraint name, SQLite the generic
+        # "UNIQUE constraint failed" prefix.
+        msg = str(exc)
+        return ('uniq_schedule_emp_office_span_times_shift' in msg
+                or 'UNIQUE constraint failed' in msg)
+
+    def create(self, validated_data):
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError as exc:
+            if not self._is_unique_conflict(exc):
+                raise
+            raise serializers.ValidationError(
+                {'non_field_errors': ['An identical schedule already exists.']}
+            )
+
+    def update(self, instance, validated_data):
+        # Updates can collide with another row's unique key just like
+        # creates; same conflict translation as create().
+        try:
+            with transaction.atomic():
+                return super().update(instance, validated_data)
+        except IntegrityError as exc:
+            if not self._is_unique_conflict(exc):
+                raise
+            raise serializers.ValidationError(
+                {'non_field_errors': ['An identical schedule already exists.']}
             )
-        ]
@@ -0,0 +1,60 @@
+"""Background processing for large roster uploads.
+
+Large sheets are persisted to storage and imported on a worker thread so
+the request (and its gunicorn worker) returns immediately. Job status
+lives in the cache under ``roster_upload:<job_id>`` and can be polled
+from the admin.
+"""
+from __future__ import annotations
+
+import threading
+import uuid
+
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+
+from .uploads import RosterImportError, import_roster_file
+
+JOB_KEY = "roster_upload:{}"
+JOB_TTL = 60 * 60
+
+
+def job_status(job_id: str) -> dict | None:
+    """Return the cached status dict for an upload job, if still known."""
+    return cache.get(JOB_KEY.format(job_id))
+
+
+def _set_status(job_id: str, **status) -> None:
+    cache.set(JOB_KEY.format(job_id), status, JOB_TTL)
+
+
+def enqueue_roster_upload(django_file) -> str:
+    """
+    Persist the uploaded workbook and import it on a background thread.
+
+    Returns a job id whose progress can be read via ``job_status``.
+    """
+    job_id = uuid.uuid4().hex
+    storage_key = default_storage.save(f"roster_uploads/{job_id}.xlsx", django_file)
+    _set_status(job_id, state="pending")
+    threading.Thread(
+        target=_process_roster_upload,
+        args=(storage_key, job_id),
+        daemon=True,
+        name=f"roster-upload-{job_id[:8]}",
+    ).start()
+    return job_id
+
+
+def _process_roster_upload(storage_key: str, job_id: str) -> None:
+    _set_status(job_id, state="running")
+    try:
+        with default_storage.open(storage_key) as f:
+            result = import_roster_file(f)
+        _set_status(job_id, state="done", **result)
+    except RosterImportError as exc:
+        _set_status(job_id, state="failed", error=str(exc))
+    except Exception as exc:  # surface the failure to the poller
+        _set_status(job_id, state="failed", error=str(exc))
+    finally:
+        default_storage.delete(storage_key)
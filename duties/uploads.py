@@ -0,0 +1,407 @@
+"""Shared machinery for roster Excel bulk uploads.
+
+Used by the admin bulk-upload view (synchronously for small files) and by
+the background task in ``duties.tasks`` for large sheets.
+
+The fast path parses the workbook with python-calamine straight into
+native Python rows — the roster format is a fixed 8-column sheet, so the
+full pandas machinery (type inference, block manager, per-cell boxing)
+is unnecessary. openpyxl's streaming read-only mode is the second tier,
+and pandas remains as a last-resort fallback (mainly for .xls files).
+"""
+from __future__ import annotations
+
+import csv
+import datetime
+import io
+import sys
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # annotations only — the runtime import stays lazy
+    import pandas as pd
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from org.models import Office
+from .models import RosterAssignment, _NEPAL_PHONE_RE
+from .serializers import (
+    ALLOWED_HEADERS_TUPLE,
+    ALLOWED_HEADER_SET,
+    HEADER_MAP,
+)
+
+# Natural key of a roster row — mirrors the model's unique constraint
+ROSTER_KEY_FIELDS = (
+    "employee_name", "office", "start_date", "end_date",
+    "start_time", "end_time", "shift",
+)
+
+# Model field names in sheet-column order, resolved once at import time —
+# the strict header check guarantees every sheet matches this layout, so
+# no per-upload (or worse, per-row) HEADER_MAP lookups are needed. The
+# names are interned so the per-row dict(zip(...)) inserts resolve on
+# pointer equality instead of re-hashing each key string.
+ROSTER_FIELD_ORDER = tuple(sys.intern(HEADER_MAP[c]) for c in ALLOWED_HEADERS_TUPLE)
+
+# Above this many new rows, the create batch is streamed with COPY on
+# PostgreSQL — multi-value INSERTs re-parse SQL per batch, COPY doesn't.
+COPY_THRESHOLD = 20000
+
+
+class RosterImportError(Exception):
+    """Raised when an uploaded workbook cannot be parsed or has bad headers."""
+
+
+def import_roster_file(f, dry_run: bool = False) -> dict:
+    """
+    Parse and import an uploaded roster workbook.
+
+    Prefers the calamine list-of-rows path (no DataFrame construction);
+    falls back to pandas. Raises ``RosterImportError`` for unreadable
+    files or header mismatches, otherwise returns the result dict of
+    the importer (created / updated / failed / errors). With
+    ``dry_run=True`` nothing is written; the counts report what a real
+    import would do.
+    """
+    rows = _read_roster_rows(f)
+    if rows is None:
+        f.seek(0)
+        rows = _read_roster_rows_openpyxl(f)
+    if rows is not None:
+        return import_roster_rows(rows, dry_run=dry_run)
+
+    f.seek(0)
+    try:
+        df = read_roster_excel(f)
+    except Exception as e:
+        raise RosterImportError(f"Could not read Excel file: {e}")
+    header_error = check_roster_headers(df)
+    if header_error:
+        raise RosterImportError(header_error)
+    return import_roster_dataframe(df, dry_run=dry_run)
+
+
+def _read_roster_rows(f):
+    """Parse the first worksheet into native Python rows, or None on failure."""
+    try:
+        from python_calamine import CalamineWorkbook
+    except ImportError:
+        return None
+    try:
+        wb = CalamineWorkbook.from_filelike(f)
+        return wb.get_sheet_by_index(0).to_python(skip_empty_area=True)
+    except Exception:
+        return None
+
+
+def _read_roster_rows_openpyxl(f):
+    """
+    Stream the first worksheet with openpyxl's read-only mode, or None on
+    failure (e.g. an .xls file).
+
+    read_only skips the DOM build and styles that make the default mode
+    balloon on big workbooks; data_only returns cached values for formula
+    cells. Rows that are entirely empty are dropped, matching calamine's
+    ``skip_empty_area``.
+    """
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        return None
+    try:
+        wb = load_workbook(filename=f, read_only=True, data_only=True)
+    except Exception:
+        return None
+    try:
+        return [
+            list(row)
+            for row in wb.active.iter_rows(values_only=True)
+            if any(cell is not None for cell in row)
+        ]
+    finally:
+        wb.close()
+
+
+def read_roster_excel(f) -> pd.DataFrame:
+    """
+    Read an uploaded roster workbook into a DataFrame.
+
+    Tries the Rust-backed calamine engine first, then openpyxl, then
+    pandas' engine guess (for .xls). pandas is imported lazily so the
+    streaming tiers don't pay its ~100MB / ~1s import per worker.
+    """
+    import pandas as pd
+
+    try:
+        return pd.read_excel(f, engine="calamine")
+    except Exception:
+        f.seek(0)
+        try:
+            return pd.read_excel(f, engine="openpyxl")
+        except Exception:
+            f.seek(0)
+            return pd.read_excel(f)
+
+
+def _header_error_message(columns) -> str:
+    col_set = frozenset(columns)
+    missing = [c for c in ALLOWED_HEADERS_TUPLE if c not in col_set]
+    extra = [c for c in columns if c not in ALLOWED_HEADER_SET]
+    msg_parts = []
+    if missing:
+        msg_parts.append(f"Missing columns: {', '.join(missing)}")
+    if extra:
+        msg_parts.append(f"Unexpected columns: {', '.join(extra)}")
+    return " | ".join(msg_parts)
+
+
+def check_roster_headers(df: pd.DataFrame) -> str | None:
+    """Normalize headers in place; return an error message on mismatch."""
+    df.columns = [str(c).strip() for c in df.columns]
+    if tuple(df.columns) != ALLOWED_HEADERS_TUPLE:
+        return _header_error_message(df.columns)
+    return None
+
+
+def _coerce_date(value):
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    if value in (None, ""):
+        return None
+    try:
+        return datetime.date.fromisoformat(str(value).strip()[:10])
+    except ValueError:
+        return None
+
+
+def _coerce_time(value):
+    if isinstance(value, datetime.time):
+        return value
+    if isinstance(value, datetime.datetime):
+        return value.time()
+    if value in (None, ""):
+        return None
+    try:
+        return datetime.time.fromisoformat(str(value).strip())
+    except ValueError:
+        return None
+
+
+def _office_name_map() -> dict:
+    """lowered name -> canonical org.Office name, loaded with one query."""
+    return {
+        name.lower(): name
+        for name in Office.objects.values_list("name", flat=True)
+    }
+
+
+def _copy_create_batch(objs: list) -> None:
+    """
+    Stream a pre-split create batch into the table with COPY FROM STDIN
+    (PostgreSQL only). The rows are already deduplicated against the
+    table, so no conflict handling is needed; auto_now(_add) timestamps
+    are filled in here because COPY bypasses the ORM.
+    """
+    cols = (
+        "status", "start_date", "end_date", "start_time", "end_time",
+        "shift", "employee_name", "phone_number", "office",
+        "created_at", "updated_at",
+    )
+    now = timezone.now()
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for o in objs:
+        writer.writerow((
+            o.status, o.start_date, o.end_date, o.start_time, o.end_time,
+            o.shift, o.employee_name, o.phone_number, o.office,
+            now, now,
+        ))
+    buf.seek(0)
+    sql = (
+        f"COPY {RosterAssignment._meta.db_table} ({', '.join(cols)}) "
+        "FROM STDIN WITH (FORMAT csv, NULL '')"
+    )
+    with connection.cursor() as cur:
+        if hasattr(cur, "copy_expert"):  # psycopg2
+            cur.copy_expert(sql, buf)
+        else:  # psycopg 3
+            with cur.copy(sql) as cp:
+                cp.write(buf.getvalue())
+
+
+def _write_roster_objects(objs: list, dry_run: bool = False) -> tuple:
+    """
+    Split rows into creates vs updates with one SELECT and write both
+    batches in a single transaction. A plain ON CONFLICT upsert can't be
+    used here because start/end_date are nullable key columns and NULLs
+    never match the unique constraint, so re-uploads would duplicate
+    those rows. Returns (created_count, updated_count); with
+    ``dry_run=True`` the same single diff query produces the counts and
+    nothing is written.
+    """
+    existing = {
+        key: pk
+        for (pk, *key_parts) in RosterAssignment.objects.filter(
+            employee_name__in={o.employee_name for o in objs}
+        ).values_list("pk", *ROSTER_KEY_FIELDS)
+        for key in [tuple(key_parts)]
+    }
+    to_create, to_update = [], []
+    for o in objs:
+        pk = existing.get(tuple(getattr(o, f) for f in ROSTER_KEY_FIELDS))
+        if pk is None:
+            to_create.append(o)
+        else:
+            o.pk = pk
+            to_update.append(o)
+
+    if dry_run:
+        return len(to_create), len(to_update)
+
+    with transaction.atomic():
+        if to_create:
+            if (connection.vendor == "postgresql"
+                    and len(to_create) > COPY_THRESHOLD):
+                _copy_create_batch(to_create)
+            else:
+                RosterAssignment.objects.bulk_create(to_create, batch_size=1000)
+        if to_update:
+            # bulk_update skips auto_now, so bump updated_at explicitly —
+            # the schedule list ETag keys on Max(updated_at) and would
+            # otherwise serve stale 304s after a phone-only re-upload.
+            now = timezone.now()
+            for o in to_update:
+                o.updated_at = now
+            RosterAssignment.objects.bulk_update(
+                to_update, ["phone_number", "updated_at"], batch_size=1000
+            )
+    return len(to_create), len(to_update)
+
+
+def import_roster_rows(data: list, dry_run: bool = False) -> dict:
+    """
+    Import calamine-parsed rows (first row = headers, cells already typed
+    as date/time/str by the Rust reader). Raises ``RosterImportError`` on
+    a header mismatch.
+    """
+    header = [str(c).strip() for c in data[0]] if data else []
+    if tuple(header) != ALLOWED_HEADERS_TUPLE:
+        raise RosterImportError(_header_error_message(header))
+    fields = ROSTER_FIELD_ORDER
+    n_cols = len(fields)
+
+    known_offices = _office_name_map()
+    failed_count = 0
+    row_errors = []
+    objs = []
+    for row_no, raw in enumerate(data[1:], start=2):  # Excel rows are 1-based
+        raw = tuple(raw) + (None,) * (n_cols - len(raw))
+        rec = dict(zip(fields, raw))
+
+        rec["start_date"] = _coerce_date(rec["start_date"])
+        rec["end_date"] = _coerce_date(rec["end_date"])
+        rec["start_time"] = _coerce_time(rec["start_time"])
+        rec["end_time"] = _coerce_time(rec["end_time"])
+        rec["employee_name"] = str(rec["employee_name"] or "").strip()
+        rec["shift"] = str(rec["shift"] or "").strip()
+        if (
+            rec["start_date"] is None
+            or rec["start_time"] is None
+            or rec["end_time"] is None
+            or not rec["employee_name"]
+        ):
+            failed_count += 1
+            row_errors.append(f"Row {row_no}: invalid or missing required values")
+            continue
+
+        office = known_offices.get(str(rec["office"] or "").strip().lower())
+        if office is None:
+            failed_count += 1
+            row_errors.append(f"Row {row_no}: Office '{rec['office']}' not found")
+            continue
+        rec["office"] = office
+
+        # Same rule as RosterAssignment.clean(): blank out invalid numbers
+        phone = str(rec["phone_number"] or "").strip()
+        rec["phone_number"] = phone if _NEPAL_PHONE_RE.fullmatch(phone) else None
+
+        objs.append(RosterAssignment(**rec))
+
+    created_count, updated_count = _write_roster_objects(objs, dry_run=dry_run)
+    return {
+        "created": created_count,
+        "updated": updated_count,
+        "failed": failed_count,
+        "errors": row_errors,
+    }
+
+
+def import_roster_dataframe(df: pd.DataFrame, dry_run: bool = False) -> dict:
+    """
+    Coerce, validate and upsert a header-checked roster DataFrame
+    (pandas fallback path).
+
+    Returns ``{'created': int, 'updated': int, 'failed': int, 'errors': [...]}``.
+    """
+    import pandas as pd
+
+    failed_count = 0
+    row_errors = []
+
+    # Use only required columns in expected order, renamed to model fields
+    df = df[list(ALLOWED_HEADERS_TUPLE)].rename(columns=HEADER_MAP)
+
+    # Vectorized coercion: one C-level pass per column instead of a
+    # Python parse + serializer round-trip per cell.
+    df["start_date"] = pd.to_datetime(df["start_date"], errors="coerce").dt.date
+    df["end_date"] = pd.to_datetime(df["end_date"], errors="coerce").dt.date
+    df["start_time"] = pd.to_datetime(df["start_time"].astype(str), errors="coerce").dt.time
+    df["end_time"] = pd.to_datetime(df["end_time"].astype(str), errors="coerce").dt.time
+    df["employee_name"] = df["employee_name"].astype(str).str.strip()
+    df["shift"] = df["shift"].astype(str).str.strip()
+    df["office"] = df["office"].astype(str).str.strip()
+    # Same rule as RosterAssignment.clean(): blank out invalid Nepal numbers
+    phone = df["phone_number"].astype(str).str.strip()
+    df["phone_number"] = phone.where(phone.str.fullmatch(_NEPAL_PHONE_RE.pattern), None)
+
+    # Collect rows that failed coercion instead of raising per row
+    invalid = (
+        df["start_date"].isna()
+        | df["start_time"].isna()
+        | df["end_time"].isna()
+        | (df["employee_name"] == "")
+    )
+    for idx in df.index[invalid]:
+        failed_count += 1
+        row_errors.append(f"Row {idx + 2}: invalid or missing required values")  # Excel rows are 1-based
+    df = df[~invalid]
+
+    # Resolve office names against org.Office with one query and a
+    # dict lookup — the old serializer path queried per row.
+    known_offices = _office_name_map()
+    office_key = df["office"].str.lower()
+    unknown = ~office_key.isin(known_offices)
+    for idx in df.index[unknown]:
+        failed_count += 1
+        row_errors.append(f"Row {idx + 2}: Office '{df.at[idx, 'office']}' not found")
+    df = df[~unknown]
+    # Store the canonical casing from org.Office
+    df["office"] = office_key[~unknown].map(known_offices)
+
+    # NaT/NaN -> None so the ORM stores NULLs, not the string "NaT"
+    df = df.astype(object).where(pd.notna(df), None)
+
+    objs = [
+        RosterAssignment(**dict(zip(df.columns, row)))
+        for row in df.itertuples(index=False, name=None)
+    ]
+    created_count, updated_count = _write_roster_objects(objs, dry_run=dry_run)
+    return {
+        "created": created_count,
+        "updated": updated_count,
+        "failed": failed_count,
+        "errors": row_errors,
+    }
@@ -1,16 +1,27 @@
 from datetime import timedelta
 import datetime
-import pandas as pd  # ✅ Needed for Excel parsing in roster bulk upload
+import json
 
+from django.http import StreamingHttpResponse
 from django.shortcuts import render, get_object_or_404
 from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F, Max
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_page
+from django.views.decorators.http import etag
+from django.views.decorators.vary import vary_on_headers
 
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 
+from config.renderers import NDJSONRenderer
+
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 from drf_spectacular.utils import extend_schema, OpenApiExample, OpenApiParameter
@@ -25,43 +36,106 @@ from .serializers import (
     DocumentSerializer,
     ScheduleSerializer,
     ALLOWED_HEADERS,
-    HEADER_MAP,
-    RosterAssignmentSerializer,
 )
+from .uploads import RosterImportError, import_roster_file
+
+
+def _schedule_etag(request, *args, **kwargs):
+    """Cheap change marker for conditional GETs: one MAX() aggregate."""
+    latest = Schedule.objects.aggregate(m=Max('updated_at'))['m']
+    return f'"{latest.isoformat()}"' if latest else None
 
 
 class ScheduleView(viewsets.ModelViewSet):
     queryset = Schedule.objects.all()
     serializer_class = ScheduleSerializer
+    renderer_classes = list(api_settings.DEFAULT_RENDERER_CLASSES) + [NDJSONRenderer]
+
+    # Conditional GETs collapse unchanged reads to a 304 costing one
+    # aggregate query; cache_page short-circuits repeat renders within
+    # 60s, varied on Authorization so users don't share entries.
+    @method_decorator(etag(_schedule_etag))
+    @method_decorator(cache_page(60))
+    @method_decorator(vary_on_headers('Authorization'))
+    def list(self, request, *args, **kwargs):
+        # Same serializer-free fast path as the duty viewsets: plain dicts
+        # straight from the DB, no Schedule instances or per-row serializer
+        # construction. office is a CharField here, so there is no name to
+        # join — the stored string is the display value.
+        rows = self.filter_queryset(self.get_queryset()).values(
+            'id', 'status', 'start_date', 'end_date', 'start_time', 'end_time',
+            'shift', 'employee_name', 'office', 'phone_number',
+            'created_at', 'updated_at',
+        )
+        # ?format=ndjson streams one JSON object per line through a
+        # server-side cursor, so multi-year exports stay O(chunk_size)
+        # in memory instead of building one giant response body.
+        if request.query_params.get('format') == 'ndjson':
+            return StreamingHttpResponse(
+                (json.dumps(row, default=str) + '\n'
+                 for row in rows.iterator(chunk_size=2000)),
+                content_type='application/x-ndjson',
+            )
+        return Response(list(rows))
+
+    # Natural key shared by RosterAssignment and Schedule (both unique
+    # constraints cover the same seven columns).
+    SYNC_KEY_FIELDS = ('employee_name', 'office', 'start_date', 'end_date',
+                       'start_time', 'end_time', 'shift')
 
     @action(detail=False, methods=['post'], url_path='sync-from-roster')
     def sync_from_roster(self, request):
         """
         Pulls all RosterAssignment entries and inserts/updates them into Schedule.
         """
-        roster_entries = RosterAssignment.objects.all()
-        created_count, updated_count = 0, 0
-
-        for ra in roster_entries:
-            obj, created = Schedule.objects.update_or_create(
-                employee_name=ra.employee_name,
-                office=ra.office,
-                start_date=ra.start_date,
-                end_date=ra.end_date,
-                start_time=ra.start_time,
-                end_time=ra.end_time,
-                shift=ra.shift,
-                defaults={'phone_number': ra.phone_number}
-            )
-            if created:
-                created_count += 1
+        key_fields = self.SYNC_KEY_FIELDS
+
+        # Tuples straight from the DB — no RosterAssignment instances —
+        # streamed through a server-side cursor.
+        objs = [
+            Schedule(phone_number=phone, **dict(zip(key_fields, key)))
+            for (*key, phone) in RosterAssignment.objects.values_list(
+                *key_fields, 'phone_number'
+            ).iterator(chunk_size=2000)
+        ]
+
+        # Same NULL-safe upsert as the roster import: start/end_date are
+        # nullable key columns, so ON CONFLICT can't match those rows and
+        # the split must happen in Python off one keyed SELECT.
+        existing = {
+            key: pk
+            for (pk, *key_parts) in Schedule.objects.filter(
+                employee_name__in={o.employee_name for o in objs}
+            ).values_list('pk', *key_fields)
+            for key in [tuple(key_parts)]
+        }
+        to_create, to_update = [], []
+        for o in objs:
+            pk = existing.get(tuple(getattr(o, f) for f in key_fields))
+            if pk is None:
+                to_create.append(o)
             else:
-                updated_count += 1
+                o.pk = pk
+                to_update.append(o)
+
+        with transaction.atomic():
+            if to_create:
+                Schedule.objects.bulk_create(to_create, batch_size=1000)
+            if to_update:
+                # bulk_update skips auto_now; without the explicit bump the
+                # _schedule_etag marker never moves and conditional GETs
+                # keep returning 304 for the old phone numbers.
+                now = timezone.now()
+                for o in to_update:
+                    o.updated_at = now
+                Schedule.objects.bulk_update(
+                    to_update, ['phone_number', 'updated_at'], batch_size=1000
+                )
 
         return Response({
             "message": "Schedule sync complete",
-            "created": created_count,
-            "updated": updated_count
+            "created": len(to_create),
+            "updated": len(to_update)
         }, status=status.HTTP_200_OK)
 
 
@@ -90,7 +164,9 @@ class BulkDocumentUploadView(APIView):
         responses={201: DocumentSerializer(many=True)}
     )
     def post(self, request, *args, **kwargs):
-        serializer = BulkDocumentUploadSerializer(data=request.data)
+        serializer = BulkDocumentUploadSerializer(
+            data=request.data, context={'request': request}
+        )
         serializer.is_valid(raise_exception=True)
         documents = serializer.save()
         return Response(
@@ -103,6 +179,7 @@ class DutyChartViewSet(viewsets.ModelViewSet):
     queryset = DutyChart.objects.all()
     serializer_class = DutyChartSerializer
     permission_classes = [permissions.IsAuthenticated]
+    renderer_classes = list(api_settings.DEFAULT_RENDERER_CLASSES) + [NDJSONRenderer]
 
     @swagger_auto_schema(
         operation_description="List duty charts, optionally filtered by office ID.",
@@ -114,11 +191,43 @@ class DutyChartViewSet(viewsets.ModelViewSet):
             )
         ]
     )
+    @method_decorator(cache_page(60))
+    @method_decorator(vary_on_headers('Authorization'))
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        # Read-only fast path: emit plain dicts straight from the DB instead
+        # of running every row through the ModelSerializer field machinery.
+        # Keys mirror DutyChartSerializer.to_representation exactly.
+        rows = self.get_queryset().values(
+            'id', 'office', 'effective_date', 'end_date',
+            'employee_name', 'phone_number',
+            office_name=F('office__name'),
+            department_name=F('office__department__name'),
+            directorate_name=F('office__department__directorate__name'),
+        )
+        # Same ndjson streaming contract as ScheduleView.list; streamed
+        # responses are never cached by cache_page, which is what we want
+        # for unbounded exports.
+        if request.query_params.get('format') == 'ndjson':
+            return StreamingHttpResponse(
+                (json.dumps(row, default=str) + '\n'
+                 for row in rows.iterator(chunk_size=2000)),
+                content_type='application/x-ndjson',
+            )
+        return Response(list(rows))
 
     def get_queryset(self):
-        queryset = DutyChart.objects.all()
+        # The serializer walks office -> department -> directorate, so join
+        # the chain up front instead of paying 3 extra queries per row, and
+        # fetch only the columns it reads — the joined rows would otherwise
+        # carry every column of four tables.
+        queryset = DutyChart.objects.select_related(
+            'office__department__directorate'
+        ).only(
+            'id', 'office', 'effective_date', 'end_date',
+            'employee_name', 'phone_number',
+            'office__name', 'office__department__name',
+            'office__department__directorate__name',
+        )
         office_id = self.request.query_params.get('office', None)
         if office_id:
             queryset = queryset.filter(office_id=office_id)
@@ -129,6 +238,7 @@ class DutyViewSet(viewsets.ModelViewSet):
     queryset = Duty.objects.all()
     serializer_class = DutySerializer
     permission_classes = [permissions.IsAuthenticated]
+    renderer_classes = list(api_settings.DEFAULT_RENDERER_CLASSES) + [NDJSONRenderer]
 
     @swagger_auto_schema(
         operation_description="List duties, optionally filtered by chart, user, date, and/or shift.",
@@ -140,10 +250,29 @@ class DutyViewSet(viewsets.ModelViewSet):
         ]
     )
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        # Same serializer-free fast path as DutyChartViewSet.list
+        rows = self.get_queryset().values(
+            'id', 'user', 'duty_chart', 'date', 'shift',
+            'is_completed', 'currently_available', 'start_time', 'end_time',
+            user_name=F('user__full_name'),
+            office_name=F('duty_chart__office__name'),
+        )
+        if request.query_params.get('format') == 'ndjson':
+            return StreamingHttpResponse(
+                (json.dumps(row, default=str) + '\n'
+                 for row in rows.iterator(chunk_size=2000)),
+                content_type='application/x-ndjson',
+            )
+        return Response(list(rows))
 
     def get_queryset(self):
-        queryset = Duty.objects.all()
+        # The serializer touches user.full_name and duty_chart.office.name;
+        # same narrow-column treatment as DutyChartViewSet.
+        queryset = Duty.objects.select_related('user', 'duty_chart__office').only(
+            'id', 'user', 'duty_chart', 'date', 'shift',
+            'is_completed', 'currently_available', 'start_time', 'end_time',
+            'user__full_name', 'duty_chart__office__name',
+        )
         chart_id = self.request.query_params.get('duty_chart', None)
         user_id = self.request.query_params.get('user', None)
         date = self.request.query_params.get('date', None)
@@ -181,25 +310,45 @@ class DutyViewSet(viewsets.ModelViewSet):
     def bulk_upsert(self, request):
         """Create/update multiple Duty entries at once."""
         data = request.data
-        created, updated = 0, 0
-        for item in data:
-            obj, was_created = Duty.objects.update_or_create(
+        objs = [
+            Duty(
                 user_id=item['user'],
                 duty_chart_id=item['duty_chart'],
-                date=item['date'],
-                defaults={
-                    'shift': item['shift'],
-                    'is_completed': item.get('is_completed', False),
-                    'currently_available': item.get('currently_available', True),
-                    'start_time': item['start_time'],
-                    'end_time': item['end_time'],
-                }
+                date=datetime.date.fromisoformat(str(item['date'])),
+                shift=item['shift'],
+                is_completed=item.get('is_completed', False),
+                currently_available=item.get('currently_available', True),
+                start_time=item['start_time'],
+                end_time=item['end_time'],
             )
-            if was_created:
-                created += 1
-            else:
-                updated += 1
-        return Response({'created': created, 'updated': updated}, status=status.HTTP_200_OK)
+            for item in data
+        ]
+        if not objs:
+            return Response({'created': 0, 'updated': 0}, status=status.HTTP_200_OK)
+
+        # One keyed SELECT keeps the created/updated split in the response;
+        # the write itself is a single ON CONFLICT upsert against the
+        # (user, duty_chart, date) constraint instead of 2 queries per row.
+        existing = set(
+            Duty.objects.filter(
+                duty_chart_id__in={o.duty_chart_id for o in objs},
+                date__in={o.date for o in objs},
+            ).values_list('user_id', 'duty_chart_id', 'date')
+        )
+        updated = sum(
+            (o.user_id, o.duty_chart_id, o.date) in existing for o in objs
+        )
+
+        with transaction.atomic():
+            Duty.objects.bulk_create(
+                objs,
+                batch_size=1000,
+                update_conflicts=True,
+                unique_fields=['user', 'duty_chart', 'date'],
+                update_fields=['shift', 'is_completed',
+                               'currently_available', 'start_time', 'end_time'],
+            )
+        return Response({'created': len(objs) - updated, 'updated': updated}, status=status.HTTP_200_OK)
 
     @swagger_auto_schema(
         method='post',
@@ -233,33 +382,51 @@ class DutyViewSet(viewsets.ModelViewSet):
             return Response({'detail': 'end_date must be after or equal to start_date'}, status=status.HTTP_400_BAD_REQUEST)
 
         days = (end - start).days + 1
-        created, updated, skipped = 0, 0, 0
-
-        for i in range(days):
-            duty_date = start + timedelta(days=i)
-            shift_val = pattern[i % len(pattern)]
-            if overwrite:
-                obj, was_created = Duty.objects.update_or_create(
-                    user_id=user_id,
-                    duty_chart_id=chart_id,
-                    date=duty_date,
-                    defaults={'shift': shift_val}
-                )
-                if was_created:
-                    created += 1
-                else:
-                    updated += 1
-            else:
-                obj, was_created = Duty.objects.get_or_create(
-                    user_id=user_id,
-                    duty_chart_id=chart_id,
-                    date=duty_date,
-                    defaults={'shift': shift_val}
-                )
-                if was_created:
-                    created += 1
+
+        # Build the whole rotation in Python and write it with one batched
+        # insert instead of 2 queries per day (a year-long rotation used to
+        # cost 730 round trips).
+        objs = [
+            Duty(
+                user_id=user_id,
+                duty_chart_id=chart_id,
+                date=start + timedelta(days=i),
+                shift=pattern[i % len(pattern)],
+            )
+            for i in range(days)
+        ]
+        # An ON CONFLICT upsert can't update existing days here because this
+        # endpoint only carries the shift, not the NOT NULL time columns an
+        # insert attempt would need — so split on one keyed SELECT instead.
+        existing = dict(
+            Duty.objects.filter(
+                user_id=user_id, duty_chart_id=chart_id,
+                date__range=(start, end),
+            ).values_list('date', 'pk')
+        )
+
+        if overwrite:
+            to_create, to_update = [], []
+            for o in objs:
+                pk = existing.get(o.date)
+                if pk is None:
+                    to_create.append(o)
                 else:
-                    skipped += 1
+                    o.pk = pk
+                    to_update.append(o)
+            with transaction.atomic():
+                if to_create:
+                    Duty.objects.bulk_create(to_create, batch_size=1000)
+                if to_update:
+                    Duty.objects.bulk_update(to_update, ['shift'], batch_size=1000)
+            created, updated, skipped = len(to_create), len(to_update), 0
+        else:
+            to_create = [o for o in objs if o.date not in existing]
+            with transaction.atomic():
+                if to_create:
+                    Duty.objects.bulk_create(to_create, batch_size=1000)
+            created, updated = len(to_create), 0
+            skipped = len(objs) - len(to_create)
 
         return Response({'created': created, 'updated': updated, 'skipped': skipped}, status=status.HTTP_200_OK)
 
@@ -284,6 +451,13 @@ class RosterBulkUploadView(APIView):
                 type=openapi.TYPE_FILE,
                 description=f'Excel file (.xls/.xlsx) with columns: {", ".join(ALLOWED_HEADERS)}',
                 required=True
+            ),
+            openapi.Parameter(
+                name='dry_run',
+                in_=openapi.IN_FORM,
+                type=openapi.TYPE_BOOLEAN,
+                description='Validate and count created/updated without writing',
+                required=False
             )
         ],
         responses={201: 'Roster assignments created/updated successfully'}
@@ -294,63 +468,32 @@ class RosterBulkUploadView(APIView):
         if not file_obj:
             return Response({'detail': 'File is required.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            df = pd.read_excel(file_obj)
-        except Exception as e:
-            return Response({'detail': f'Invalid Excel file: {e}'}, status=status.HTTP_400_BAD_REQUEST)
-
-        # Normalize headers
-        df.columns = [str(c).strip() for c in df.columns]
-
-        # Strict header check
-        if list(df.columns) != ALLOWED_HEADERS:
-            missing = [c for c in ALLOWED_HEADERS if c not in df.columns]
-            extra = [c for c in df.columns if c not in ALLOWED_HEADERS]
-            msg_parts = []
-            if missing:
-                msg_parts.append(f"Missing columns: {', '.join(missing)}")
-            if extra:
-                msg_parts.append(f"Unexpected columns: {', '.join(extra)}")
-            return Response({'detail': " | ".join(msg_parts)}, status=status.HTTP_400_BAD_REQUEST)
-
-        created_count, updated_count, failed_count = 0, 0, 0
-        errors = []
-
-        for idx, row in df.iterrows():
-            try:
-                row_dict = {HEADER_MAP[col]: row[col] for col in ALLOWED_HEADERS}
-
-                # Resolve office FK if needed
-                if isinstance(row_dict.get('office'), str):
-                    office_obj = Office.objects.filter(name__iexact=row_dict['office']).first()
-                    if not office_obj:
-                        failed_count += 1
-                        errors.append(f"Row {idx+2}: Office '{row_dict['office']}' not found")
-                        continue
-                    row_dict['office'] = office_obj
-
-                serializer = RosterAssignmentSerializer(data=row_dict)
-                serializer.is_valid(raise_exception=True)
-                instance = serializer.save()
-
-                # Track created vs updated
-                if getattr(instance, "_state", None) and not instance._state.adding:
-                    updated_count += 1
-                else:
-                    created_count += 1
+        # Dry run costs the same single diff SELECT as a real import, not
+        # one .exists() probe per row; nothing is written.
+        dry_run = str(request.data.get('dry_run', '')).lower() in ('1', 'true', 'yes')
 
-            except Exception as e:
-                failed_count += 1
-                errors.append(f"Row {idx+2}: {e}")
+        # Shared batched pipeline (also used by the admin upload): columns are
+        # validated and coerced in bulk, offices resolved with one query, and
+        # rows written with bulk_create/bulk_update inside one transaction
+        # instead of a serializer save per row.
+        try:
+            result = import_roster_file(file_obj, dry_run=dry_run)
+        except RosterImportError as e:
+            return Response({'detail': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
         detail = (
-            f"Created: {created_count}, "
-            f"Updated: {updated_count}, "
-            f"Failed: {failed_count}"
+            f"Created: {result['created']}, "
+            f"Updated: {result['updated']}, "
+            f"Failed: {result['failed']}"
         )
 
         resp = {'detail': detail}
-        if errors:
-            resp['errors'] = errors[:10]  # Limit returned errors for safety
+        if dry_run:
+            resp['dry_run'] = True
+        if result['errors']:
+            resp['errors'] = result['errors'][:10]  # Limit returned errors for safety
 
-        return Response(resp, status=status.HTTP_201_CREATED)
+        return Response(
+            resp,
+            status=status.HTTP_200_OK if dry_run else status.HTTP_201_CREATED,
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.17 on 2026-08-27 05:15
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('org', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='office',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='org_office_lower_name_idx'),
+        ),
+    ]
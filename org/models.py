@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.functions import Lower
 
 # Create your models here.
 
@@ -19,5 +20,12 @@ class Office(models.Model):
     name = models.CharField(max_length=255)
     department = models.ForeignKey(Department, on_delete=models.CASCADE, related_name='offices')
 
+    class Meta:
+        indexes = [
+            # Case-insensitive name lookups (roster uploads accept office
+            # names in any casing) get an index instead of a full scan.
+            models.Index(Lower('name'), name='org_office_lower_name_idx'),
+        ]
+
     def __str__(self):
         return self.name
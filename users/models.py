@@ -38,15 +38,26 @@ class User(AbstractUser):
 
     def clean(self):
         super().clean()
+        # Compare foreign keys by id instead of dereferencing the lazy
+        # relations: the attribute chains fetched and instantiated full
+        # Department/Directorate/Office rows on every save.
         # Ensure department belongs to the selected directorate
-        if self.department and self.directorate:
-            if self.department.directorate != self.directorate:
+        if self.department_id and self.directorate_id:
+            directorate_id = (
+                Department.objects.values_list('directorate_id', flat=True)
+                .get(pk=self.department_id)
+            )
+            if directorate_id != self.directorate_id:
                 raise ValidationError({
                     "department": "Selected department does not belong to the chosen directorate."
                 })
         # Ensure office belongs to the selected department
-        if self.office and self.department:
-            if self.office.department != self.department:
+        if self.office_id and self.department_id:
+            department_id = (
+                Office.objects.values_list('department_id', flat=True)
+                .get(pk=self.office_id)
+            )
+            if department_id != self.department_id:
                 raise ValidationError({
                     "office": "Selected office does not belong to the chosen department."
                 })